@@ -1,10 +1,133 @@
 # core/downloader.py
+import functools
+import importlib
+import math
+import multiprocessing
 import os
+import queue
+import re
+import shutil
+import tempfile
 import threading
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, Set
 
 from PySide6.QtCore import QObject, Signal
-from yt_dlp import YoutubeDL
+
+# yt_dlp loads its whole extractor registry on import, so it is imported
+# where it's first needed rather than during GUI startup
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+
+# yt-dlp format selectors; {v}/{a} are the preferred video/audio extensions
+_DEFAULT_TMPL = "bestvideo[ext={v}]+bestaudio[ext={a}]/best[ext={v}]/best"
+_FORMAT_TEMPLATES: Dict[str, str] = {
+    "Best (video+audio)": _DEFAULT_TMPL,
+    "Best video only": "bestvideo[ext={v}]",
+    "Best audio only": "bestaudio[ext={a}]",
+    "1440p": "bestvideo[height<=1440][ext={v}]+bestaudio[ext={a}]/best[height<=1440][ext={v}]",
+    "1080p": "bestvideo[height<=1080][ext={v}]+bestaudio[ext={a}]/best[height<=1080][ext={v}]",
+    "720p": "bestvideo[height<=720][ext={v}]+bestaudio[ext={a}]/best[height<=720][ext={v}]",
+    "480p": "bestvideo[height<=480][ext={v}]+bestaudio[ext={a}]/best[height<=480][ext={v}]",
+    "360p": "bestvideo[height<=360][ext={v}]+bestaudio[ext={a}]/best[height<=360][ext={v}]",
+    "Worst (video+audio)": "worstvideo[ext={v}]+worstaudio[ext={a}]/worst[ext={v}]",
+}
+
+# Cheap pre-check so YouTube URLs can skip yt-dlp's scan over every extractor
+_YT_RE = re.compile(r'^https?://(?:www\.|m\.|music\.)?(?:youtube\.com|youtu\.be)/')
+
+# Fields of a yt-dlp progress dict read by the progress hook, in unpacking order
+_PROGRESS_KEYS = ('status', 'total_bytes', 'downloaded_bytes', 'speed', 'eta')
+
+_SPEED_UNITS = ('B/s', 'KB/s', 'MB/s', 'GB/s')
+
+# Minimum interval between progress signals sent to the UI (100 ms)
+_EMIT_INTERVAL_NS = 100_000_000
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_format(format_label: str, v_ext: str, a_ext: str, custom: Optional[str]) -> str:
+    """Return the yt-dlp format selector for a UI format label."""
+    if format_label == "Custom format code..." and custom:
+        return custom
+    tmpl = _FORMAT_TEMPLATES.get(format_label, _DEFAULT_TMPL)
+    return tmpl.format(v=v_ext, a=a_ext)
+
+
+class _QueueProgressHook:
+    """Progress hook for playlist worker processes that reports through a queue."""
+
+    def __init__(self, progress_queue: multiprocessing.Queue, stop_event: Any):
+        self._queue = progress_queue
+        self._stop_event = stop_event
+        self._last_put_ns = 0
+
+    def __call__(self, progress: Dict[str, Any]) -> None:
+        if self._stop_event.is_set():
+            raise Exception("Download stopped by user")
+
+        if progress['status'] not in ('downloading', 'finished'):
+            return
+
+        # Keep IPC traffic at the same rate the UI is updated; always send the finished tick
+        now = time.monotonic_ns()
+        if progress['status'] == 'downloading' and now < self._last_put_ns + _EMIT_INTERVAL_NS:
+            return
+        self._last_put_ns = now
+
+        # info_dict is not picklable; only the id is needed to tell entries apart
+        self._queue.put({
+            'status': progress['status'],
+            'downloaded_bytes': progress.get('downloaded_bytes'),
+            'total_bytes': progress.get('total_bytes'),
+            'speed': progress.get('speed'),
+            'eta': progress.get('eta'),
+            'info_dict': {'id': (progress.get('info_dict') or {}).get('id', '')},
+        })
+
+
+# Per-process state of playlist workers, set up by _init_playlist_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _add_container_convertor(ydl: 'YoutubeDL', container_ext: Optional[str]) -> None:
+    """Install the post-processor that moves videos into the target container."""
+    if not container_ext:
+        return
+    # Imported here for the same reason as yt_dlp itself
+    from core.postprocess import ContainerConvertorPP
+
+    ydl.add_post_processor(ContainerConvertorPP(ydl, container_ext), when='post_process')
+
+
+def _init_playlist_worker(ydl_opts: Dict[str, Any], container_ext: Optional[str],
+                          progress_queue: multiprocessing.Queue, stop_event: Any) -> None:
+    """Initialize a playlist worker process."""
+    from yt_dlp import YoutubeDL
+
+    _worker_state['stop_event'] = stop_event
+    # One instance per worker so extractor state (signature cache, cookies,
+    # tokens) is set up once and shared by every entry this process handles
+    _worker_state['ydl'] = YoutubeDL({
+        **ydl_opts,
+        'progress_hooks': [_QueueProgressHook(progress_queue, stop_event)]
+    })
+    _add_container_convertor(_worker_state['ydl'], container_ext)
+
+
+def _download_playlist_entry(entry: Dict[str, Any]) -> None:
+    """Download a single playlist entry (runs in a worker process)."""
+    if _worker_state['stop_event'].is_set():
+        return
+    try:
+        # Unprocessed entries are url results carrying an ie_key, so this
+        # resolves each one directly without a second playlist lookup
+        _worker_state['ydl'].process_ie_result(entry, download=True)
+    except Exception as e:
+        # yt-dlp errors carry a traceback and logger that can't be pickled back
+        # to the parent, which would replace the real reason with a PicklingError
+        raise RuntimeError(str(e)) from None
 
 
 class DownloadManager(QObject):
@@ -13,8 +136,7 @@ class DownloadManager(QObject):
     # Signals to update UI
     progress_updated = Signal(int)  # percentage
     status_updated = Signal(str)
-    speed_updated = Signal(str)
-    eta_updated = Signal(str)
+    progress_updated_batch = Signal(dict)  # raw percent/speed/eta, throttled
     download_complete = Signal(bool, str)  # success, message
     download_stopped = Signal()
 
@@ -23,15 +145,51 @@ class DownloadManager(QObject):
         self._stop_flag = False
         self._download_thread: Optional[threading.Thread] = None
         self._ydl_opts: Dict[str, Any] = {}
+        self._container_ext: Optional[str] = None
+        self._last_request: Optional[tuple] = None
+        self._ydl: Optional['YoutubeDL'] = None
+        self._ydl_lock = threading.Lock()
+        self._max_workers = 1
+        self._entry_count = 0
+        self._playlist_count = 0
+        self._entry_percent: Dict[str, float] = {}
+        self._aria2c_available = shutil.which('aria2c') is not None
+        self._last_emit_ns = 0
+        self._last_pct = -1
 
-    def start_download(self, url: str, format_label: str, output_path: str, options: Dict[str, bool]) -> None:
+        # Cookies gathered by one YoutubeDL instance (consent, visitor data) are saved
+        # here so later instances and playlist workers start from the same session.
+        # Created on the first download (see _session_cookie_file).
+        self._session_dir: Optional[str] = None
+
+        # Warm the yt_dlp import in the background so the first download doesn't wait on it
+        threading.Thread(target=importlib.import_module, args=('yt_dlp',), daemon=True).start()
+
+    @property
+    def aria2c_available(self) -> bool:
+        """Whether the aria2c binary was found on PATH."""
+        return self._aria2c_available
+
+    def start_download(self, url: str, format_label: str, output_path: str, options: Dict[str, Any]) -> None:
         """Start a download in a separate thread."""
         if self._download_thread and self._download_thread.is_alive():
             self.status_updated.emit("A download is already in progress")
             return
 
         self._stop_flag = False
-        self._ydl_opts = self._build_ydl_options(format_label, output_path, options)
+        request = (format_label, output_path, options)
+        if request != self._last_request:
+            # Settings changed: rebuild the yt-dlp options and drop the YoutubeDL
+            # instance built from the old ones. Otherwise both are reused as-is.
+            self._ydl_opts = self._build_ydl_options(format_label, output_path, options)
+            self._close_ydl()
+            self._last_request = (format_label, output_path, dict(options))
+        self._max_workers = max(1, min(int(options.get('parallel_downloads', 1)), 8))
+        self._entry_count = 0
+        self._playlist_count = 0
+        self._entry_percent = {}
+        self._last_emit_ns = 0
+        self._last_pct = -1
         
         self._download_thread = threading.Thread(
             target=self._download_video,
@@ -51,42 +209,62 @@ class DownloadManager(QObject):
         if self._download_thread and self._download_thread.is_alive():
             self.stop_download()
             self._download_thread.join(timeout=2)
+        # Only remove the cookie file once nothing can still save to it
+        if self._close_ydl() and self._session_dir:
+            shutil.rmtree(self._session_dir, ignore_errors=True)
+            self._session_dir = None
+
+    def _close_ydl(self) -> bool:
+        """Close the cached YoutubeDL instance, if any. Return False if it is still in use."""
+        # Don't block on a download that is still winding down; it owns the instance
+        if not self._ydl_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._ydl is not None:
+                self._ydl.close()
+                self._ydl = None
+        finally:
+            self._ydl_lock.release()
+        return True
+
+    def _session_cookie_file(self) -> str:
+        """Return the session cookie file path, creating its directory on first use."""
+        if self._session_dir is None:
+            self._session_dir = tempfile.mkdtemp(prefix='video-downloader-')
+        return os.path.join(self._session_dir, 'cookies.txt')
 
     # core/downloader.py (updated sections)
     def _build_ydl_options(self, format_label: str, output_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Build yt-dlp options dictionary with expanded format options."""
+        output_path = os.fspath(output_path) or os.curdir
         # Determine default formats
         default_video_ext = options['remux_format'].lower() if options.get('remux_format') and options['remux_format'] != "Default" else 'mp4'
         default_audio_ext = options['audio_format'].lower() if options.get('audio_format') else 'm4a'
         
         # Audio-only formats
         audio_only_formats = ["Best audio only"]
-        
-        format_map = {
-            "Best (video+audio)": f"bestvideo[ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[ext={default_video_ext}]/best",
-            "Best video only": f"bestvideo[ext={default_video_ext}]",
-            "Best audio only": f"bestaudio[ext={default_audio_ext}]",
-            "1440p": f"bestvideo[height<=1440][ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[height<=1440][ext={default_video_ext}]",
-            "1080p": f"bestvideo[height<=1080][ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[height<=1080][ext={default_video_ext}]",
-            "720p": f"bestvideo[height<=720][ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[height<=720][ext={default_video_ext}]",
-            "480p": f"bestvideo[height<=480][ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[height<=480][ext={default_video_ext}]",
-            "360p": f"bestvideo[height<=360][ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[height<=360][ext={default_video_ext}]",
-            "Worst (video+audio)": f"worstvideo[ext={default_video_ext}]+worstaudio[ext={default_audio_ext}]/worst[ext={default_video_ext}]",
-            "Custom format code...": options.get('custom_format', 
-                f"bestvideo[ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[ext={default_video_ext}]/best")
-        }
+        self._container_ext = None
 
         ydl_opts = {
-            'format': format_map.get(format_label, 
-                f"bestvideo[ext={default_video_ext}]+bestaudio[ext={default_audio_ext}]/best[ext={default_video_ext}]/best"),
-            'outtmpl': os.path.join(output_path, '%(title)s.%(ext)s'),
+            'format': _resolve_format(format_label, default_video_ext, default_audio_ext,
+                                      options.get('custom_format')),
+            'outtmpl': f"{output_path.rstrip(os.sep)}{os.sep}%(title)s.%(ext)s",
             'progress_hooks': [self._progress_hook],
             'quiet': True,
             'no_warnings': True,
             'ignoreerrors': False,
             'restrictfilenames': True,
             'merge_output_format': default_video_ext,
-            'postprocessors': []
+            'postprocessors': [],
+            # Reuse connections across fragment requests instead of reconnecting
+            'http_headers': {'Connection': 'keep-alive', 'Keep-Alive': 'timeout=30, max=1000'},
+            'socket_timeout': 30,
+            'cookiefile': self._session_cookie_file(),
+            # Fetch DASH/HLS fragments in parallel; HLS via the native downloader,
+            # which honors the concurrency setting (ffmpeg does not)
+            'concurrent_fragment_downloads': int(options.get('concurrent_fragments', 8)),
+            'http_chunk_size': 10_485_760,  # 10 MiB
+            'hls_prefer_native': True
         }
 
         # Audio options
@@ -102,17 +280,25 @@ class DownloadManager(QObject):
                 'preferredquality': str(options['audio_quality'])
             })
         else:
-            # For video downloads, add video conversion postprocessor
-            ydl_opts['postprocessors'].append({
-                'key': 'FFmpegVideoConvertor',
-                'preferedformat': default_video_ext
-            })
+            # For video downloads, convert to the target container once the codecs
+            # are known (see _add_container_convertor)
+            self._container_ext = default_video_ext
 
         # Remux options (only if explicitly selected and not Default)
         if options.get('remux_format') and options['remux_format'] != "Default":
             ydl_opts['remuxvideo'] = options['remux_format']
             # Don't convert if we're remuxing
             ydl_opts['postprocessors'] = []
+            self._container_ext = None
+
+        # Multi-connection fetching through aria2c (skipped when not installed)
+        if options.get('aria2c') and self._aria2c_available:
+            connections = str(options.get('aria2c_connections', 16))
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = {
+                'default': ['-x', connections, '-s', connections, '-k', '1M',
+                            '--file-allocation=none', '--enable-http-keep-alive=true']
+            }
 
         # Post-processing options
         if options.get('subtitles'):
@@ -149,14 +335,29 @@ class DownloadManager(QObject):
         """Download video using yt-dlp (runs in separate thread)."""
         try:
             self.status_updated.emit("Preparing download...")
+            from yt_dlp import YoutubeDL
+
+            # Reuse one YoutubeDL across downloads so extractor state (signature
+            # cache, cookies, tokens) is only set up once per set of options
+            with self._ydl_lock:
+                if self._ydl is None:
+                    self._ydl = YoutubeDL(dict(self._ydl_opts))
+                    _add_container_convertor(self._ydl, self._container_ext)
+                ydl = self._ydl
 
-            with YoutubeDL(self._ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+                # Extract once without resolving formats; playlists stay lazy
+                info = ydl.extract_info(url, download=False, process=False,
+                                        ie_key=self._extractor_hint(ydl, url))
                 if not info:
                     raise Exception("Failed to extract video info")
 
+                if not self._ydl_opts['noplaylist'] and info.get('_type') in ('playlist', 'multi_video'):
+                    self._download_playlist(info)
+                    return
+
                 self.status_updated.emit(f"Downloading: {info.get('title', 'video')}")
-                ydl.download([url])
+                # Reuse the extracted info rather than letting download() fetch it again
+                info = ydl.process_ie_result(info, download=True)
 
                 if self._stop_flag:
                     self.status_updated.emit("Download cancelled")
@@ -171,42 +372,183 @@ class DownloadManager(QObject):
             self.status_updated.emit(f"Error: {str(e)}")
             self.download_complete.emit(False, str(e))
 
+    @staticmethod
+    def _extractor_hint(ydl: 'YoutubeDL', url: str) -> Optional[str]:
+        """Return the YouTube extractor key for a URL, or None to let yt-dlp search."""
+        if not _YT_RE.match(url):
+            return None
+        # Only two suitability checks instead of one per registered extractor
+        for ie_key in ('Youtube', 'YoutubeTab'):
+            if ydl.get_info_extractor(ie_key).suitable(url):
+                return ie_key
+        return None
+
+    def _download_playlist(self, info: Dict[str, Any]) -> None:
+        """Download playlist entries in parallel on a process pool."""
+        # Entries may be a lazy generator/paged list; pull them as the pool needs
+        # them so downloads start before every playlist page has been fetched
+        entry_iter: Iterator[Dict[str, Any]] = (entry for entry in info.get('entries') or [] if entry)
+        # Size reported by the extractor, if any; entries are counted as they're pulled
+        self._playlist_count = info.get('playlist_count') or 0
+        self.status_updated.emit(
+            f"Downloading playlist: {info.get('title', 'playlist')} "
+            f"({self._max_workers} at a time)"
+        )
+
+        # Entries run in separate processes so format parsing and post-processing
+        # in one download don't contend for the GIL with the others. The progress
+        # hook is bound to this QObject and can't be pickled, so workers install
+        # their own hook and report through a queue instead.
+        ctx = multiprocessing.get_context('spawn')
+        progress_queue = ctx.Queue()
+        stop_event = ctx.Event()
+        worker_opts = {k: v for k, v in self._ydl_opts.items() if k != 'progress_hooks'}
+        # Workers load the cookie file on startup, so hand them this session's cookies
+        self._ydl.save_cookies()
+
+        failed = 0
+        first_error: Optional[str] = None
+        executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=ctx,
+            initializer=_init_playlist_worker,
+            initargs=(worker_opts, self._container_ext, progress_queue, stop_event)
+        )
+        try:
+            entry_for: Dict[Future, Dict[str, Any]] = {}
+            pending: Set[Future] = set()
+            exhausted = False
+            while True:
+                if self._stop_flag:
+                    stop_event.set()
+                    break
+                # Keep only a couple of entries queued per worker ahead of the pool
+                while not exhausted and len(pending) < self._max_workers * 2:
+                    entry = next(entry_iter, None)
+                    if entry is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(_download_playlist_entry, entry)
+                    entry_for[future] = entry
+                    pending.add(future)
+                    self._entry_count += 1
+                if not pending:
+                    break
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception()
+                    if error is None:
+                        continue
+                    failed += 1
+                    if first_error is None:
+                        # Keep the first reason for the user
+                        entry = entry_for[future]
+                        name = entry.get('title') or entry.get('id') or entry.get('url', 'video')
+                        first_error = f"{name}: {error}"
+                self._relay_worker_progress(progress_queue)
+        finally:
+            # Drop queued entries on stop; running ones abort via their progress hook
+            executor.shutdown(wait=True, cancel_futures=self._stop_flag)
+
+        if self._stop_flag:
+            self.status_updated.emit("Download cancelled")
+            self.download_stopped.emit()
+            return
+
+        if not self._entry_count:
+            raise Exception("Playlist has no downloadable entries")
+
+        if failed:
+            message = f"{failed} of {self._entry_count} playlist videos failed (first error: {first_error})"
+            self.status_updated.emit(f"Error: {message}")
+            self.download_complete.emit(False, message)
+            return
+
+        self.progress_updated.emit(100)
+        self.status_updated.emit("Download complete")
+        self.download_complete.emit(True, os.path.dirname(self._ydl_opts['outtmpl']))
+
+    def _relay_worker_progress(self, progress_queue: multiprocessing.Queue) -> None:
+        """Forward progress reported by playlist worker processes to the UI."""
+        while True:
+            try:
+                progress = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_progress(progress)
+
     def _progress_hook(self, progress: Dict[str, Any]) -> None:
         """Handle progress updates from yt-dlp."""
         if self._stop_flag:
             raise Exception("Download stopped by user")
+        self._handle_progress(progress)
+
+    def _handle_progress(self, progress: Dict[str, Any]) -> None:
+        """Emit progress signals for a yt-dlp progress dict."""
+        # One pass over the dict, then plain locals for the rest of the hook.
+        # itemgetter would raise on the keys yt-dlp leaves out (e.g. total_bytes).
+        status, total, done, speed, eta = map(progress.get, _PROGRESS_KEYS)
+        finished = status == 'finished'
+        if not finished and status != 'downloading':
+            return
+
+        pct = None
+        if finished:
+            pct = 100
+        elif total:
+            # Integer math; the progress bar only shows whole percents anyway
+            pct = int(done * 100 // total)
+        if pct is not None and self._entry_count:
+            # Record every entry's progress even when the emit is throttled
+            pct = int(self._playlist_percent(progress, pct))
+
+        # yt-dlp calls this per socket read; only cross into the UI thread at ~10 Hz.
+        # The finished tick always goes through so the bar reaches 100%.
+        now = time.monotonic_ns()
+        if not finished and now < self._last_emit_ns + _EMIT_INTERVAL_NS:
+            return
+        self._last_emit_ns = now
+
+        batch: Dict[str, Any] = {}
+        if pct is not None and pct != self._last_pct:
+            # Only repaint the progress bar when the whole percent moves
+            self._last_pct = pct
+            batch['percent'] = pct
 
-        if progress['status'] == 'downloading':
-            if progress.get('total_bytes'):
-                percent = progress['downloaded_bytes'] / progress['total_bytes'] * 100
-                self.progress_updated.emit(int(percent))
-            
-            if progress.get('speed'):
-                self.speed_updated.emit(f"Speed: {self._format_speed(progress['speed'])}")
-            
-            if progress.get('eta'):
-                self.eta_updated.emit(f"ETA: {self._format_eta(progress['eta'])}")
+        # Raw values only; the UI slot does the string formatting
+        if speed:
+            batch['speed'] = speed
+
+        if eta:
+            batch['eta'] = eta
+
+        if batch:
+            self.progress_updated_batch.emit(batch)
+
+    def _playlist_percent(self, progress: Dict[str, Any], percent: float) -> float:
+        """Combine per-entry progress into an overall playlist percentage.
+
+        Each entry counts equally: sizes of entries that haven't started are
+        unknown, so a byte-weighted total would jump as new entries report in.
+        """
+        entry_id = (progress.get('info_dict') or {}).get('id', '')
+        self._entry_percent[entry_id] = percent
+        # Entries are counted as they are submitted, so prefer the extractor's total
+        return sum(self._entry_percent.values()) / max(self._entry_count, self._playlist_count)
 
     @staticmethod
     def _format_speed(speed: float) -> str:
         """Format download speed in human-readable format."""
-        if speed < 1024:
-            return f"{speed:.1f} B/s"
-        elif speed < 1024 * 1024:
-            return f"{speed / 1024:.1f} KB/s"
-        else:
-            return f"{speed / (1024 * 1024):.1f} MB/s"
+        # Each unit step is 2**10, so the unit index is log2(speed) // 10
+        i = min(int(math.log2(max(speed, 1))) // 10, 3)
+        return f"{speed / (1 << (10 * i)):.1f} {_SPEED_UNITS[i]}"
 
     @staticmethod
     def _format_eta(seconds: int) -> str:
         """Format ETA in human-readable format."""
         if seconds < 0:
             return "--:--"
-        
-        minutes, seconds = divmod(seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes:02d}:{seconds:02d}"
\ No newline at end of file
+
+        h, rem = divmod(int(seconds), 3600)
+        m, s = divmod(rem, 60)
+        return (f"{m:02d}:{s:02d}", f"{h}:{m:02d}:{s:02d}")[h > 0]
@@ -0,0 +1,50 @@
+# core/postprocess.py
+from typing import Any, Dict, List, Optional, Tuple
+
+from yt_dlp.postprocessor import FFmpegVideoConvertorPP, FFmpegVideoRemuxerPP
+
+# Codecs each container can hold as a stream copy, as (video, audio) prefixes.
+# Only mp4 is listed: an explicit remux format takes the remuxer path in
+# _build_ydl_options, so this post-processor always targets the mp4 default.
+# Containers not listed always convert.
+_COPY_CODECS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    'mp4': (('avc1', 'avc3', 'h264', 'hev1', 'hvc1', 'hevc', 'av01', 'vp09', 'vp9'),
+            ('mp4a', 'aac', 'mp3', 'opus', 'flac', 'alac', 'ac-3', 'ec-3')),
+}
+
+
+def _codec_fits(codec: Optional[str], allowed: Tuple[str, ...]) -> bool:
+    """Check whether a yt-dlp codec string (e.g. 'avc1.640028') is in the allowed list."""
+    if codec == 'none':
+        return True  # No stream of this kind to copy
+    if not codec:
+        return False  # Unknown codec; don't risk a remux ffmpeg can't do
+    return codec.split('.')[0].lower() in allowed
+
+
+class ContainerConvertorPP(FFmpegVideoConvertorPP):
+    """Move a download into the target container, remuxing instead of re-encoding when possible."""
+
+    def __init__(self, downloader=None, preferedformat: Optional[str] = None):
+        # Created first: the base __init__ calls set_downloader, which forwards to it
+        self._remuxer = FFmpegVideoRemuxerPP(downloader, preferedformat)
+        super().__init__(downloader, preferedformat)
+        self._target = (preferedformat or '').lower()
+
+    def set_downloader(self, downloader) -> None:
+        super().set_downloader(downloader)
+        self._remuxer.set_downloader(downloader)
+
+    def _can_copy(self, info: Dict[str, Any]) -> bool:
+        """Whether the downloaded streams can go into the target container unchanged."""
+        if self._target not in _COPY_CODECS:
+            return False
+        video_codecs, audio_codecs = _COPY_CODECS[self._target]
+        return (_codec_fits(info.get('vcodec'), video_codecs)
+                and _codec_fits(info.get('acodec'), audio_codecs))
+
+    def run(self, info: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+        # Stream copy costs no encoding CPU; only transcode when the codecs don't fit
+        if info.get('ext') != self._target and self._can_copy(info):
+            return self._remuxer.run(info)
+        return super().run(info)
@@ -1,7 +1,9 @@
 # main.py
+import multiprocessing
 import os
 import sys
-from typing import Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
 
 from PySide6.QtWidgets import QApplication, QMainWindow
 
@@ -9,9 +11,34 @@ from core.downloader import DownloadManager
 from ui.main_window import MainWindowUI
 
 
+@dataclass(frozen=True, slots=True)
+class DownloadOptions:
+    """Snapshot of the option widgets used to build a download."""
+    format_label: str
+    output_path: str
+    custom_format: Optional[str]
+    audio_format: str
+    audio_quality: int
+    remux_format: str
+    subtitles: bool
+    thumbnail: bool
+    metadata: bool
+    chapters: bool
+    split_chapters: bool
+    playlist: bool
+    parallel_downloads: int
+    sponsorblock: bool
+    concurrent_fragments: int
+    aria2c: bool
+    aria2c_connections: int
+    sponsorblock_categories: str
+
+
 class YTDLPGUI(QMainWindow):
     def __init__(self):
         super().__init__()
+        self._last_options: Optional[DownloadOptions] = None
+        self._last_options_dict: Dict[str, Any] = {}
         self._init_ui()
         self._init_download_manager()
         self._connect_signals()
@@ -25,14 +52,14 @@ class YTDLPGUI(QMainWindow):
     def _init_download_manager(self) -> None:
         """Initialize the download manager."""
         self.download_manager = DownloadManager()
+        self.ui.set_aria2c_available(self.download_manager.aria2c_available)
 
     def _connect_signals(self) -> None:
         """Connect all UI signals to their handlers."""
         # Download manager signals
         self.download_manager.progress_updated.connect(self.ui.update_progress)
         self.download_manager.status_updated.connect(self.ui.status_label.setText)
-        self.download_manager.speed_updated.connect(self.ui.speed_label.setText)
-        self.download_manager.eta_updated.connect(self.ui.eta_label.setText)
+        self.download_manager.progress_updated_batch.connect(self._on_progress_batch)
         self.download_manager.download_complete.connect(self._on_download_complete)
         self.download_manager.download_stopped.connect(self._on_download_stopped)
 
@@ -53,31 +80,56 @@ class YTDLPGUI(QMainWindow):
             self.ui.status_label.setText("Please enter a URL")
             return
 
-        format_ = self.ui.format_combo.currentText()
-        output_path = self.ui.output_path.text() or os.path.expanduser("~/Downloads")
-
-        # Get all options
-        options = {
-            'custom_format': self.ui.custom_format_input.text() if format_ == "Custom format code..." else None,
-            'audio_format': self.ui.audio_format_combo.currentText(),
-            'audio_quality': self.ui.audio_quality_slider.value(),
-            'remux_format': self.ui.remux_combo.currentText(),
-            'subtitles': self.ui.subtitles_check.isChecked(),
-            'thumbnail': self.ui.thumbnail_check.isChecked(),
-            'metadata': self.ui.metadata_check.isChecked(),
-            'chapters': self.ui.chapters_check.isChecked(),
-            'split_chapters': self.ui.split_chapters_check.isChecked(),
-            'playlist': self.ui.playlist_check.isChecked(),
-            'sponsorblock': self.ui.sponsorblock_check.isChecked(),
-            'sponsorblock_categories': self.ui.sponsorblock_categories.text().strip() or 'all'
-        }
+        options = self._collect_options()
+        if options != self._last_options:
+            # Settings changed; otherwise the manager gets the same dict back and
+            # can reuse the yt-dlp options it built from it last time
+            self._last_options = options
+            self._last_options_dict = {
+                k: v for k, v in asdict(options).items() if k not in ('format_label', 'output_path')
+            }
 
         # Update UI state
         self.ui.set_download_state(False)
         self.ui.reset_progress()
 
         # Start download
-        self.download_manager.start_download(url, format_, output_path, options)
+        self.download_manager.start_download(
+            url, options.format_label, options.output_path, self._last_options_dict
+        )
+
+    def _collect_options(self) -> DownloadOptions:
+        """Read the current download settings from the UI."""
+        format_ = self.ui.format_combo.currentText()
+        return DownloadOptions(
+            format_label=format_,
+            output_path=self.ui.output_path.text() or os.path.expanduser("~/Downloads"),
+            custom_format=self.ui.custom_format_input.text() if format_ == "Custom format code..." else None,
+            audio_format=self.ui.audio_format_combo.currentText(),
+            audio_quality=self.ui.audio_quality_slider.value(),
+            remux_format=self.ui.remux_combo.currentText(),
+            subtitles=self.ui.subtitles_check.isChecked(),
+            thumbnail=self.ui.thumbnail_check.isChecked(),
+            metadata=self.ui.metadata_check.isChecked(),
+            chapters=self.ui.chapters_check.isChecked(),
+            split_chapters=self.ui.split_chapters_check.isChecked(),
+            playlist=self.ui.playlist_check.isChecked(),
+            parallel_downloads=self.ui.parallel_spin.value(),
+            sponsorblock=self.ui.sponsorblock_check.isChecked(),
+            concurrent_fragments=self.ui.fragments_spin.value(),
+            aria2c=self.ui.aria2c_check.isChecked(),
+            aria2c_connections=self.ui.aria2c_connections_slider.value(),
+            sponsorblock_categories=self.ui.sponsorblock_categories.text().strip() or 'all'
+        )
+
+    def _on_progress_batch(self, batch: dict) -> None:
+        """Apply a throttled progress update from the download manager."""
+        if 'percent' in batch:
+            self.ui.update_progress(batch['percent'])
+        if 'speed' in batch:
+            self.ui.speed_label.setText(f"Speed: {DownloadManager._format_speed(batch['speed'])}")
+        if 'eta' in batch:
+            self.ui.eta_label.setText(f"ETA: {DownloadManager._format_eta(batch['eta'])}")
 
     def _on_download_complete(self, success: bool, message: str) -> None:
         """Handle download completion."""
@@ -97,6 +149,7 @@ class YTDLPGUI(QMainWindow):
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Playlist workers are spawned processes
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Set application style
     
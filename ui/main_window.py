@@ -6,11 +6,21 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QComboBox, QProgressBar, QFileDialog, QFormLayout, QCheckBox, QGroupBox,
-    QSlider, QTabWidget
+    QSlider, QSpinBox, QTabWidget
 )
 
 
 class MainWindowUI(QWidget):
+    # Post-processing checkboxes: (attribute name, label)
+    _CHECKBOX_SPEC = [
+        ('subtitles_check', "Download subtitles"),
+        ('thumbnail_check', "Download thumbnail"),
+        ('metadata_check', "Embed metadata"),
+        ('chapters_check', "Embed chapters"),
+        ('split_chapters_check', "Split by chapters"),
+        ('sponsorblock_check', "Remove sponsored segments"),
+    ]
+
     def __init__(self):
         super().__init__()
         self._init_ui()
@@ -61,7 +71,9 @@ class MainWindowUI(QWidget):
         self.advanced_tab.setLayout(advanced_layout)
         
         self._setup_additional_options()
+        self._setup_acceleration_options()
         advanced_layout.addWidget(self.advance_group)
+        advanced_layout.addWidget(self.acceleration_group)
         advanced_layout.addStretch()  # Push content to top
 
     def _setup_url_section(self) -> None:
@@ -78,7 +90,10 @@ class MainWindowUI(QWidget):
     def _setup_format_section(self) -> None:
         """Format selection section with expanded options."""
         self.format_group = QGroupBox("Download Options")
+        # Hold off repaints until every row is in place
+        self.format_group.setUpdatesEnabled(False)
         form_layout = QFormLayout()
+        form_layout.setRowWrapPolicy(QFormLayout.DontWrapRows)
         
         # Main format selection
         self.format_combo = QComboBox()
@@ -124,9 +139,7 @@ class MainWindowUI(QWidget):
         self.audio_quality_label = QLabel("VBR 5 (default)")
         form_layout.addRow("Audio quality:", self.audio_quality_slider)
         form_layout.addRow("", self.audio_quality_label)
-        self.audio_quality_slider.valueChanged.connect(
-            lambda v: self.audio_quality_label.setText(f"VBR {v}" if v < 10 else "Lossless")
-        )
+        self.audio_quality_slider.valueChanged.connect(self._on_audio_quality_changed)
         
         # Remux options
         self.remux_combo = QComboBox()
@@ -140,45 +153,44 @@ class MainWindowUI(QWidget):
         self.playlist_check.setChecked(True)
         form_layout.addRow(self.playlist_check)
         
+        # Number of playlist videos fetched at once (capped to avoid throttling)
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, 8)
+        self.parallel_spin.setValue(4)
+        form_layout.addRow("Parallel downloads:", self.parallel_spin)
+        self.playlist_check.toggled.connect(self.parallel_spin.setEnabled)
+        
         self.format_group.setLayout(form_layout)
+        self.format_group.setUpdatesEnabled(True)
 
     def _on_format_changed(self, text: str) -> None:
         """Show/hide custom format input based on selection."""
         self.custom_format_input.setVisible(text == "Custom format code...")
         self.custom_format_label.setVisible(text == "Custom format code...")
 
+    def _on_audio_quality_changed(self, v: int) -> None:
+        """Update the audio quality label as the slider moves."""
+        self.audio_quality_label.setText("Lossless" if v >= 10 else f"VBR {v}")
+
+    def _on_aria2c_connections_changed(self, v: int) -> None:
+        """Update the aria2c connection count label as the slider moves."""
+        self.aria2c_connections_label.setText(f"{v} connections")
+
     def _setup_additional_options(self) -> None:
         """Additional download options with more features."""
         self.advance_group = QGroupBox("Post-Processing Options")
+        # Hold off repaints until every option is in place
+        self.advance_group.setUpdatesEnabled(False)
         options_layout = QVBoxLayout()
         
         # Container for checkboxes
         checkbox_container = QWidget()
         checkbox_layout = QVBoxLayout(checkbox_container)
         
-        # Subtitles
-        self.subtitles_check = QCheckBox("Download subtitles")
-        checkbox_layout.addWidget(self.subtitles_check)
-        
-        # Thumbnail
-        self.thumbnail_check = QCheckBox("Download thumbnail")
-        checkbox_layout.addWidget(self.thumbnail_check)
-        
-        # Metadata
-        self.metadata_check = QCheckBox("Embed metadata")
-        checkbox_layout.addWidget(self.metadata_check)
-        
-        # Chapters
-        self.chapters_check = QCheckBox("Embed chapters")
-        checkbox_layout.addWidget(self.chapters_check)
-        
-        # Split chapters
-        self.split_chapters_check = QCheckBox("Split by chapters")
-        checkbox_layout.addWidget(self.split_chapters_check)
-        
-        # SponsorBlock
-        self.sponsorblock_check = QCheckBox("Remove sponsored segments")
-        checkbox_layout.addWidget(self.sponsorblock_check)
+        for attr, label in self._CHECKBOX_SPEC:
+            checkbox = QCheckBox(label)
+            setattr(self, attr, checkbox)
+            checkbox_layout.addWidget(checkbox)
         
         options_layout.addWidget(checkbox_container)
         
@@ -189,6 +201,39 @@ class MainWindowUI(QWidget):
         options_layout.addWidget(self.sponsorblock_categories)
         
         self.advance_group.setLayout(options_layout)
+        self.advance_group.setUpdatesEnabled(True)
+
+    def _setup_acceleration_options(self) -> None:
+        """Download transport options (fragment concurrency, aria2c)."""
+        self.acceleration_group = QGroupBox("Download Acceleration")
+        options_layout = QVBoxLayout()
+        
+        # Parallel fragment downloads for DASH/HLS formats
+        fragments_layout = QHBoxLayout()
+        self.fragments_spin = QSpinBox()
+        self.fragments_spin.setRange(1, 16)
+        self.fragments_spin.setValue(8)
+        fragments_layout.addWidget(QLabel("Concurrent fragments:"))
+        fragments_layout.addWidget(self.fragments_spin)
+        fragments_layout.addStretch()
+        options_layout.addLayout(fragments_layout)
+        
+        # aria2c acceleration
+        self.aria2c_check = QCheckBox("Accelerate with aria2c")
+        options_layout.addWidget(self.aria2c_check)
+        
+        connections_layout = QHBoxLayout()
+        self.aria2c_connections_slider = QSlider(Qt.Horizontal)
+        self.aria2c_connections_slider.setRange(1, 16)
+        self.aria2c_connections_slider.setValue(16)
+        self.aria2c_connections_label = QLabel("16 connections")
+        connections_layout.addWidget(QLabel("aria2c connections:"))
+        connections_layout.addWidget(self.aria2c_connections_slider)
+        connections_layout.addWidget(self.aria2c_connections_label)
+        options_layout.addLayout(connections_layout)
+        self.aria2c_connections_slider.valueChanged.connect(self._on_aria2c_connections_changed)
+        
+        self.acceleration_group.setLayout(options_layout)
 
     def _setup_output_section(self) -> None:
         """Output location section."""
@@ -252,6 +297,15 @@ class MainWindowUI(QWidget):
         if directory:
             self.output_path.setText(directory)
 
+    def set_aria2c_available(self, available: bool) -> None:
+        """Enable/disable the aria2c controls depending on whether aria2c is installed."""
+        tooltip = "" if available else "aria2c was not found on PATH; install it to enable this option"
+        for widget in (self.aria2c_check, self.aria2c_connections_slider):
+            widget.setEnabled(available)
+            widget.setToolTip(tooltip)
+        if not available:
+            self.aria2c_check.setChecked(False)
+
     def set_download_state(self, enabled: bool) -> None:
         """Enable/disable download controls."""
         self.download_button.setEnabled(enabled)